@@ -1,15 +1,72 @@
-from enum import Enum
+import sys
+from types import MappingProxyType
+from typing import Final, Mapping, NamedTuple, Optional
 
-class Category(Enum):
+__all__ = (
+    "Category", "CATEGORIES", "VALID_CATEGORIES", "parse_category",
+    "CATEGORY_NAMES", "Config", "CONFIG",
+    "DEFAULT_TEMPLATE_COUNT",
+    "MIN_TERMINAL_HEIGHT", "MIN_TERMINAL_WIDTH",
+    "WPM_HISTORY_SECONDS", "WPM_SAMPLES_PER_SECOND", "WPM_HISTORY_CAPACITY",
+    "FLASH_DURATION_MS", "TICK_INTERVAL_MS", "INPUT_POLL_ACTIVE_MS",
+)
+
+class Category:
+    """Template category identifiers, stored as plain strings"""
     EASY = "easy"
-    MEDIUM = "medium" 
+    MEDIUM = "medium"
     HARD = "hard"
     PYTHON = "python"
     CSTYLE = "c_style"
     PRACTICE = "practice"
     CUSTOM = "custom"
 
-CATEGORY_NAMES = {
+# Menu order
+CATEGORIES = (
+    Category.EASY,
+    Category.MEDIUM,
+    Category.HARD,
+    Category.PYTHON,
+    Category.CSTYLE,
+    Category.PRACTICE,
+    Category.CUSTOM,
+)
+VALID_CATEGORIES = frozenset(CATEGORIES)
+
+
+def parse_category(name: str) -> Optional[str]:
+    """Map an external string (argv, config, directory name) to an interned category"""
+    name = sys.intern(name)
+    return name if name in VALID_CATEGORIES else None
+
+
+DEFAULT_TEMPLATE_COUNT: Final[int] = 5
+MIN_TERMINAL_HEIGHT: Final[int] = 24
+MIN_TERMINAL_WIDTH: Final[int] = 80
+WPM_HISTORY_SECONDS: Final[int] = 10
+WPM_SAMPLES_PER_SECOND: Final[int] = 1
+# Size of the WPM sliding window; trackers keep it in a deque(maxlen=...)
+WPM_HISTORY_CAPACITY: Final[int] = WPM_HISTORY_SECONDS * WPM_SAMPLES_PER_SECOND
+# How long transient warnings stay on screen
+FLASH_DURATION_MS: Final[int] = 500
+
+# Typing loop getch timeouts: wait TICK_INTERVAL_MS for a key while idle, so
+# stats can refresh without a keypress; once a key arrives, poll with
+# INPUT_POLL_ACTIVE_MS to drain keys already queued (e.g. a paste) before
+# the next redraw
+TICK_INTERVAL_MS: Final[int] = 200
+INPUT_POLL_ACTIVE_MS: Final[int] = 0
+
+
+class Config(NamedTuple):
+    """Immutable bundle of the settings above; bind CONFIG to a local in hot loops"""
+    default_template_count: int
+    min_terminal_height: int
+    min_terminal_width: int
+    wpm_history_seconds: int
+    category_names: Mapping[str, str]
+
+CATEGORY_NAMES = MappingProxyType({
     Category.EASY: "Easy Sentences",
     Category.MEDIUM: "Medium (with numbers)",
     Category.HARD: "Hard (complex punctuation)",
@@ -17,9 +74,12 @@ CATEGORY_NAMES = {
     Category.CSTYLE: "C/Java/JavaScript",
     Category.PRACTICE: "Practice (common mistakes)",
     Category.CUSTOM: "Custom Templates"
-}
+})
 
-DEFAULT_TEMPLATE_COUNT = 5
-MIN_TERMINAL_HEIGHT = 24
-MIN_TERMINAL_WIDTH = 80
-WPM_HISTORY_SECONDS = 10
\ No newline at end of file
+CONFIG = Config(
+    default_template_count=DEFAULT_TEMPLATE_COUNT,
+    min_terminal_height=MIN_TERMINAL_HEIGHT,
+    min_terminal_width=MIN_TERMINAL_WIDTH,
+    wpm_history_seconds=WPM_HISTORY_SECONDS,
+    category_names=CATEGORY_NAMES,
+)
@@ -5,212 +5,407 @@ import sys
 import time
 import random
 import os
+import json
+import tempfile
 import textwrap
+import unicodedata
+from collections import deque
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict
-from enum import Enum
 from pathlib import Path
 
-class Category(Enum):
-    EASY = "easy"
-    MEDIUM = "medium"
-    HARD = "hard"
-    PYTHON = "python"
-    CSTYLE = "c_style"
-    PRACTICE = "practice"
-    CUSTOM = "custom"
+from constants import (
+    Category, CATEGORIES, CATEGORY_NAMES, parse_category,
+    CONFIG, FLASH_DURATION_MS, INPUT_POLL_ACTIVE_MS, TICK_INTERVAL_MS,
+    WPM_HISTORY_CAPACITY, WPM_SAMPLES_PER_SECOND,
+)
+
+# Color attributes, filled in by init_colors() once curses is running
+CP_GOOD = CP_BAD = CP_CORRECT = CP_WRONG = CP_INFO = CP_INFO_BOLD = CP_DIM = 0
+# Run status (True/False/None for untyped) to attribute, for the target line and the echo
+TARGET_ATTRS: Dict[Optional[bool], int] = {}
+ECHO_ATTRS: Dict[Optional[bool], int] = {}
+
+# The progress bar is sliced from these instead of being rebuilt every frame
+PROGRESS_BAR_WIDTH = 50
+_BAR_FILLED = "█" * PROGRESS_BAR_WIDTH
+_BAR_EMPTY = "░" * PROGRESS_BAR_WIDTH
 
 class TemplateManager:
     """Manages loading and parsing of template files"""
     
+    # Bump whenever the parsed template format changes so stale indexes are ignored
+    _INDEX_VERSION = 5
+    
     def __init__(self, templates_dir: str = "templates"):
         # Get the directory where the script is located
         script_dir = Path(__file__).parent.absolute()
         self.templates_dir = script_dir / templates_dir
-        self.cache: Dict[Category, List[str]] = {}
-        self.category_names = {
-            Category.EASY: "Easy Sentences",
-            Category.MEDIUM: "Medium (with numbers)",
-            Category.HARD: "Hard (complex punctuation)",
-            Category.PYTHON: "Python Code",
-            Category.CSTYLE: "C/Java/JavaScript",
-            Category.PRACTICE: "Practice (common mistakes)",
-            Category.CUSTOM: "Custom Templates"
-        }
-        
-    def load_templates(self, category: Category) -> List[str]:
+        # Each template is stored as its list of lines
+        self.cache: Dict[str, List[List[str]]] = {}
+        self.category_names = CATEGORY_NAMES
+        # Parsed templates persisted across runs, keyed by category
+        self._index_path = self.templates_dir / ".termtype_index.json"
+        self._index: Optional[Dict[str, Tuple[tuple, List[List[str]]]]] = None
+        # Set when the in-memory index has entries not yet written to disk
+        self._index_dirty = False
+        # Template file signatures per category, filled by one walk of templates_dir
+        self._files_by_category: Optional[Dict[str, List[Tuple[str, int, int]]]] = None
+        # (key, category, name, count) rows of the category menu, built on first use
+        self._menu_items_cache: Optional[List[Tuple[str, Optional[str], str, int]]] = None
+        
+    def load_templates(self, category: str) -> List[List[str]]:
         """Load all templates from a category directory"""
         if category in self.cache:
             return self.cache[category]
         
-        templates = []
-        category_dir = self.templates_dir / category.value
-        
-        if not category_dir.exists():
-            return [self._get_sample_template(category)]
+        files = self._scan_all().get(category)
+        if files is None:
+            return [self._get_sample_template(category).split('\n')]
         
-        # Load all .txt files in the directory
-        txt_files = sorted(category_dir.glob("*.txt"))
+        # (name, mtime, size) of every template file identifies this version of the category
+        signature = tuple(files)
         
-        for file_path in txt_files:
-            if file_path.name == "README.txt" or file_path.name.startswith("README"):
-                continue
+        index = self._load_index()
+        indexed = index.get(category)
+        if indexed is not None and indexed[0] == signature:
+            templates = indexed[1]
+        else:
+            templates = []
+            category_dir = self.templates_dir / category
+            txt_files = [category_dir / name for name, _, _ in signature]
+            
+            # Read the whole batch first, then parse
+            for content in self._read_files(txt_files):
+                content = content.strip()
                 
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    
-                    # Skip empty files
-                    if not content:
-                        continue
-                    
-                    # Parse templates
-                    file_templates = self._parse_template_file(content)
-                    templates.extend(file_templates)
-                    
-            except Exception as e:
-                continue
-        
-        # If no templates found, provide sample
-        if not templates:
-            templates = [self._get_sample_template(category)]
+                # Skip empty files
+                if not content:
+                    continue
+                
+                # Parse templates
+                file_templates = self._parse_template_file(content)
+                templates.extend(file_templates)
+            
+            # If no templates found, provide sample
+            if not templates:
+                templates = [self._get_sample_template(category).split('\n')]
+            
+            index[category] = (signature, templates)
+            # Written once by the caller after the whole batch of categories is loaded
+            self._index_dirty = True
         
         self.cache[category] = templates
         return templates
     
-    def _parse_template_file(self, content: str) -> List[str]:
-        """Parse a template file, supporting multiple templates separated by '---'"""
+    def _scan_all(self) -> Dict[str, List[Tuple[str, int, int]]]:
+        """Collect the template files of every category in a single pass over templates_dir"""
+        if self._files_by_category is None:
+            files_by_category = {}
+            try:
+                with os.scandir(self.templates_dir) as it:
+                    for entry in it:
+                        category = parse_category(entry.name)
+                        if category is not None and entry.is_dir():
+                            # An unreadable category falls back to its sample without hiding the others
+                            try:
+                                files_by_category[category] = self._scan_category(entry.path)
+                            except OSError:
+                                pass
+            except OSError:
+                pass
+            self._files_by_category = files_by_category
+        return self._files_by_category
+    
+    def _scan_category(self, category_dir: str) -> List[Tuple[str, int, int]]:
+        """List (name, mtime_ns, size) of the template files in a directory, sorted by name"""
+        entries = []
+        with os.scandir(category_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(".txt") and not name.startswith(("README", ".")) and entry.is_file():
+                    st = entry.stat()
+                    entries.append((name, st.st_mtime_ns, st.st_size))
+        entries.sort()
+        return entries
+    
+    def _load_index(self) -> Dict[str, Tuple[tuple, List[List[str]]]]:
+        """Load the on-disk template index; anything missing, unreadable or malformed is a cache miss"""
+        if self._index is None:
+            index = {}
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            
+            if isinstance(data, dict) and data.get("version") == self._INDEX_VERSION:
+                categories = data.get("categories")
+                if isinstance(categories, dict):
+                    for category, entry in categories.items():
+                        # JSON turns the signature tuples into lists; convert back so they compare equal
+                        try:
+                            signature, templates = entry
+                            signature = tuple(tuple(file_sig) for file_sig in signature)
+                        except (TypeError, ValueError):
+                            continue
+                        if self._is_template_list(templates):
+                            index[category] = (signature, templates)
+            self._index = index
+        return self._index
+    
+    @staticmethod
+    def _is_template_list(templates) -> bool:
+        """Check that an indexed value is a list of non-empty lists of strings"""
+        return isinstance(templates, list) and all(
+            isinstance(template, list) and template and all(isinstance(line, str) for line in template)
+            for template in templates
+        )
+    
+    def _flush_index(self):
+        """Write the index to disk if categories were parsed since the last write"""
+        if self._index_dirty:
+            self._save_index()
+            self._index_dirty = False
+    
+    def _save_index(self):
+        """Atomically rewrite the on-disk template index; failures are ignored"""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.templates_dir, prefix=".termtype_index.")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": self._INDEX_VERSION, "categories": self._index}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self._index_path)
+        except Exception:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    def _read_files(self, paths: List[Path]) -> List[str]:
+        """Read a batch of template files, skipping any that cannot be read"""
+        contents = []
+        for file_path in paths:
+            try:
+                content = file_path.read_bytes().decode('utf-8')
+            except Exception:
+                continue
+            # Binary reads skip universal-newline translation, so normalise here
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            contents.append(content)
+        return contents
+    
+    def _parse_template_file(self, content: str) -> List[List[str]]:
+        """Parse a template file into templates (lists of lines), separated by '---'"""
         templates = []
+        lines = []
         
-        # Split by separator line
-        parts = content.split('\n---\n')
-        
-        for part in parts:
-            part = part.strip()
-            if part and not part.startswith('#'):
-                # Remove any inline comments
+        # Single pass: collect lines until a separator closes the template
+        for line in content.split('\n'):
+            if line == '---':
+                self._close_template(lines, templates)
                 lines = []
-                for line in part.split('\n'):
-                    if not line.lstrip().startswith('#'):
-                        # Preserve the line exactly as is, including indentation
-                        lines.append(line)
-                
-                template = '\n'.join(lines).strip()
-                if template:
-                    templates.append(template)
+            elif not line.lstrip().startswith('#'):
+                # Preserve the line exactly as is, including indentation
+                lines.append(line)
         
+        self._close_template(lines, templates)
         return templates
     
-    def _get_sample_template(self, category: Category) -> str:
+    def _close_template(self, lines: List[str], templates: List[List[str]]):
+        """Trim surrounding blank lines from a finished template and keep it if anything is left"""
+        start, end = 0, len(lines)
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        
+        if start < end:
+            template = lines[start:end]
+            template[0] = template[0].lstrip()
+            template[-1] = template[-1].rstrip()
+            templates.append(template)
+    
+    def _get_sample_template(self, category: str) -> str:
         """Provide a sample template if none exist"""
-        samples = {
-            Category.EASY: "The quick brown fox jumps over the lazy dog.",
-            Category.MEDIUM: "Python 3.12 was released in 2024 with 42 new features.",
-            Category.HARD: "Email: user@example.com, Phone: 555-123-4567, Date: 2024-03-15",
-            Category.PYTHON: "def hello():\n    print('Hello, World!')",
-            Category.CSTYLE: "#include <stdio.h>\n\nint main() {\n    printf('Hello');\n    return 0;\n}",
-            Category.PRACTICE: "teh (should be: the)\nrecieve (should be: receive)",
-            Category.CUSTOM: "Add your own templates in templates/custom/"
-        }
-        return samples.get(category, "Sample template")
-    
-    def get_random_templates(self, category: Category, count: int = 3) -> List[str]:
+        match category:
+            case Category.EASY:
+                return "The quick brown fox jumps over the lazy dog."
+            case Category.MEDIUM:
+                return "Python 3.12 was released in 2024 with 42 new features."
+            case Category.HARD:
+                return "Email: user@example.com, Phone: 555-123-4567, Date: 2024-03-15"
+            case Category.PYTHON:
+                return "def hello():\n    print('Hello, World!')"
+            case Category.CSTYLE:
+                return "#include <stdio.h>\n\nint main() {\n    printf('Hello');\n    return 0;\n}"
+            case Category.PRACTICE:
+                return "teh (should be: the)\nrecieve (should be: receive)"
+            case Category.CUSTOM:
+                return "Add your own templates in templates/custom/"
+            case _:
+                return "Sample template"
+    
+    def get_random_templates(self, category: str, count: int = 3) -> List[List[str]]:
         """Get random templates from a category"""
         templates = self.load_templates(category)
+        self._flush_index()
         
         # Ensure we don't ask for more than available
         count = min(count, len(templates))
         if count == 0:
-            return [self._get_sample_template(category)]
+            return [self._get_sample_template(category).split('\n')]
         
         return random.sample(templates, count)
     
-    def get_category_info(self) -> Dict[Category, Tuple[str, int]]:
+    def get_category_info(self) -> Dict[str, Tuple[str, int]]:
         """Get information about all categories"""
         info = {}
-        for category in Category:
+        for category in CATEGORIES:
             templates = self.load_templates(category)
             info[category] = (self.category_names[category], len(templates))
+        self._flush_index()
         return info
+    
+    def get_menu_items(self) -> List[Tuple[str, Optional[str], str, int]]:
+        """Get the category menu rows, ending with the quit entry"""
+        # Template files are scanned once per run, so the counts cannot change afterwards
+        if self._menu_items_cache is None:
+            menu_items = []
+            for i, (category, (name, count)) in enumerate(self.get_category_info().items()):
+                menu_items.append((str(i + 1), category, name, count))
+            menu_items.append(("q", None, "Quit", 0))
+            self._menu_items_cache = menu_items
+        return self._menu_items_cache
 
 class TypingTest:
-    def __init__(self, category: Category, templates: List[str]):
+    def __init__(self, category: str, templates: List[List[str]]):
         self.category = category
-        # Store each template as a list of lines to preserve structure
-        self.templates = [template.split('\n') for template in templates]
+        # Templates arrive from TemplateManager already split into lines
+        self.templates = templates
+        total_chars_all_lines = sum(sum(map(len, lines)) for lines in templates)
         self.current_template_index = 0
         self.current_line_index = 0
         self.current_template = self.templates[0] if self.templates else []
         self.user_input = []  # List of characters typed for current line
-        self.start_time = None
-        self.end_time = None
+        # Per-character correctness of user_input, kept in step with it
+        self.matches: List[bool] = []
+        self._correct_in_line = 0
+        # Monotonic timestamps in nanoseconds
+        self.start_ns: Optional[int] = None
+        self.end_ns: Optional[int] = None
         self.correct_chars = 0
         self.total_chars = 0
-        self.wpm_history = []
-        self.last_update_time = None
+        self.wpm_history = deque(maxlen=WPM_HISTORY_CAPACITY)
+        self._wpm_sum = 0.0  # Running sum of wpm_history
+        self._instant_wpm = 0.0
+        # (instant_wpm, avg_wpm, accuracy), recomputed only after input changes
+        self._stats_dirty = True
+        self._cached_stats = (0.0, 0.0, 100.0)
+        self._status_cache: Tuple[Optional[tuple], str] = (None, "")
         
-        # Calculate total characters for progress
-        self.total_chars_all_lines = sum(len(line) for template in self.templates for line in template)
+        self.total_chars_all_lines = total_chars_all_lines
         self.completed_chars = 0
+        self._total_templates = len(self.templates)
+        self._progress_cache: Optional[Tuple[int, int, int, int, int, int]] = None
+        self._update_current_line()
         
+    def _update_current_line(self):
+        """Cache the current line and its length; call whenever the line or template index changes"""
+        if self.current_template and self.current_line_index < len(self.current_template):
+            self._current_line_str = self.current_template[self.current_line_index]
+        else:
+            self._current_line_str = ""
+        self._current_line_len = len(self._current_line_str)
+    
     def get_current_line(self) -> str:
         """Get the current line to type"""
-        if self.current_template and self.current_line_index < len(self.current_template):
-            return self.current_template[self.current_line_index]
-        return ""
+        return self._current_line_str
     
     def is_line_complete(self) -> bool:
         """Check if current line is completely typed"""
+        return len(self.user_input) >= self._current_line_len
+    
+    def tick(self):
+        """Periodic timer hook: recompute WPM and add it to the history"""
+        if self.start_ns is None:
+            return
+        wpm = self._update_wpm(time.monotonic_ns())
+        if wpm is not None:
+            # The deque drops the oldest sample; keep the running sum in step
+            if len(self.wpm_history) == self.wpm_history.maxlen:
+                self._wpm_sum -= self.wpm_history[0]
+            self.wpm_history.append(wpm)
+            self._wpm_sum += wpm
+        self._stats_dirty = True
+    
+    def type_char(self, char: str):
+        """Append a typed character to the current line"""
         current_line = self.get_current_line()
-        return len(self.user_input) >= len(current_line)
+        pos = len(self.user_input)
+        is_match = pos < len(current_line) and char == current_line[pos]
+        self.user_input.append(char)
+        self.matches.append(is_match)
+        self._correct_in_line += is_match
+        self._stats_dirty = True
+    
+    def delete_char(self) -> bool:
+        """Remove the last typed character. Returns True if one was removed."""
+        if not self.user_input:
+            return False
+        self.user_input.pop()
+        self._correct_in_line -= self.matches.pop()
+        self._stats_dirty = True
+        return True
     
     def move_to_next_line(self) -> bool:
         """Move to next line in current template. Returns True if template complete."""
         self.current_line_index += 1
         self.user_input = []
+        self._progress_cache = None
+        self.matches = []
+        self._correct_in_line = 0
         
         if self.current_line_index >= len(self.current_template):
             return self.move_to_next_template()
+        self._update_current_line()
         return False
     
     def move_to_next_template(self) -> bool:
         """Move to next template. Returns True if all templates complete."""
         self.current_template_index += 1
         self.current_line_index = 0
+        self._progress_cache = None
         
         if self.current_template_index >= len(self.templates):
+            self._update_current_line()
             return True
         
         self.current_template = self.templates[self.current_template_index]
+        self._update_current_line()
         return False
     
+    def _update_wpm(self, now_ns: int) -> Optional[float]:
+        """Recompute the instant WPM at now_ns; returns the unrounded value, or None if there is none yet"""
+        elapsed_ns = now_ns - self.start_ns
+        if elapsed_ns > 0 and self.completed_chars > 0:
+            wpm = (self.completed_chars / 5) / (elapsed_ns / 60_000_000_000)
+            self._instant_wpm = round(wpm, 1)
+            return wpm
+        return None
+    
     def calculate_instant_wpm(self) -> float:
-        """Calculate real-time WPM based on current typing speed"""
-        if not self.start_time:
-            return 0.0
-        
-        now = time.time()
-        elapsed = now - self.start_time
-        
-        if elapsed > 0 and self.completed_chars > 0:
-            minutes = elapsed / 60
-            wpm = (self.completed_chars / 5) / minutes
-            
-            # Update history every second
-            if self.last_update_time is None or now - self.last_update_time >= 1.0:
-                self.wpm_history.append(wpm)
-                self.last_update_time = now
-                # Keep last 10 seconds of history
-                if len(self.wpm_history) > 10:
-                    self.wpm_history.pop(0)
-            
-            return round(wpm, 1)
-        return 0.0
+        """Return the real-time WPM as of the last tick or submitted line"""
+        return self._instant_wpm
     
     def calculate_average_wpm(self) -> float:
         """Calculate average WPM over the last 10 seconds"""
         if not self.wpm_history:
             return 0.0
-        return round(sum(self.wpm_history) / len(self.wpm_history), 1)
+        return round(self._wpm_sum / len(self.wpm_history), 1)
     
     def calculate_accuracy(self) -> float:
         """Calculate typing accuracy"""
@@ -218,29 +413,35 @@ class TypingTest:
             return 100.0
         return round((self.correct_chars / self.total_chars) * 100, 1)
     
+    def get_stats(self) -> Tuple[float, float, float]:
+        """Return (instant_wpm, avg_wpm, accuracy), cached until the input changes"""
+        if self._stats_dirty:
+            self._cached_stats = (self.calculate_instant_wpm(),
+                                  self.calculate_average_wpm(),
+                                  self.calculate_accuracy())
+            self._stats_dirty = False
+        return self._cached_stats
+    
+    def status_text(self, category_name: str) -> str:
+        """Return the status bar text, reformatted only when its values change"""
+        key = (self.get_stats(), self.get_progress(), category_name)
+        if self._status_cache[0] != key:
+            (instant_wpm, avg_wpm, accuracy), progress, _ = key
+            current_template, total_templates, current_line, total_lines, completed_chars, total_chars = progress
+            text = f" WPM: {instant_wpm:>5.1f} (avg: {avg_wpm:>5.1f}) | Accuracy: {accuracy:>5.1f}% | Template: {current_template}/{total_templates} | Line: {current_line}/{total_lines} | Chars: {completed_chars}/{total_chars} | {category_name} "
+            self._status_cache = (key, text)
+        return self._status_cache[1]
+    
     def get_progress(self) -> Tuple[int, int, int, int, int, int]:
         """Return (current_template, total_templates, current_line, total_lines, completed_chars, total_chars)"""
-        total_lines_in_template = len(self.current_template) if self.current_template else 0
-        current_line = self.current_line_index + 1 if total_lines_in_template > 0 else 0
-        
-        return (self.current_template_index + 1, len(self.templates),
-                current_line, total_lines_in_template,
-                self.completed_chars, self.total_chars_all_lines)
-    
-    def check_character(self, char_pos: int) -> Optional[bool]:
-        """Check if character at position is correct"""
-        current_line = self.get_current_line()
-        
-        if not current_line:
-            return None
-        
-        if char_pos >= len(current_line):
-            return None
-        
-        if char_pos >= len(self.user_input):
-            return None
-        
-        return self.user_input[char_pos] == current_line[char_pos]
+        if self._progress_cache is None:
+            total_lines_in_template = len(self.current_template) if self.current_template else 0
+            current_line = self.current_line_index + 1 if total_lines_in_template > 0 else 0
+            
+            self._progress_cache = (self.current_template_index + 1, self._total_templates,
+                                    current_line, total_lines_in_template,
+                                    self.completed_chars, self.total_chars_all_lines)
+        return self._progress_cache
     
     def submit_line(self) -> bool:
         """Submit current line, return True if test is complete"""
@@ -248,64 +449,66 @@ class TypingTest:
             return False
         
         current_line = self.get_current_line()
+        self._stats_dirty = True
         
-        # Start timer on first line
-        if self.start_time is None:
-            self.start_time = time.time()
-            self.last_update_time = time.time()
+        now_ns = time.monotonic_ns()
         
-        # Calculate correct characters for this line
-        line_correct = 0
-        for i, char in enumerate(self.user_input):
-            if i < len(current_line) and char == current_line[i]:
-                line_correct += 1
+        # Start timer on first line
+        if self.start_ns is None:
+            self.start_ns = now_ns
         
-        self.correct_chars += line_correct
+        self.correct_chars += self._correct_in_line
         self.total_chars += len(current_line)
         self.completed_chars += len(current_line)
+        self._progress_cache = None
+        self._update_wpm(now_ns)
         
         # Move to next line or template
         is_complete = self.move_to_next_line()
         
-        # If test is complete, set end_time
+        # If test is complete, set end_ns
         if is_complete:
-            self.end_time = time.time()
+            self.end_ns = now_ns
         
         return is_complete
 
-def draw_menu(stdscr, height, width, template_manager: TemplateManager) -> Optional[Category]:
+@lru_cache(maxsize=4096)
+def _char_width(ch: str) -> int:
+    """Terminal columns taken by a character: 0 for combining marks, 2 for wide forms"""
+    if unicodedata.combining(ch):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1
+
+def _display_width(text: str) -> int:
+    """Terminal columns taken by a string"""
+    return sum(map(_char_width, text))
+
+def _center_x(width: int, text: str) -> int:
+    """Column at which text is centered in a row of the given width"""
+    return max(0, (width - _display_width(text)) // 2)
+
+def draw_menu(stdscr, height, width, template_manager: TemplateManager) -> Optional[str]:
     """Draw category selection menu"""
-    stdscr.clear()
+    stdscr.erase()
     
     # Title
     title = "⚡ TERMTYPE - WPM TEST ⚡"
     try:
-        stdscr.attron(curses.color_pair(4) | curses.A_BOLD)
-        x = max(0, (width // 2) - (len(title) // 2))
-        stdscr.addstr(2, x, title)
-        stdscr.attroff(curses.color_pair(4) | curses.A_BOLD)
+        x = _center_x(width, title)
+        stdscr.addstr(2, x, title, CP_INFO_BOLD)
     except:
         pass
     
     # Subtitle
     subtitle = "Select Template Category:"
     try:
-        x = max(0, (width // 2) - (len(subtitle) // 2))
+        x = _center_x(width, subtitle)
         stdscr.addstr(4, x, subtitle)
     except:
         pass
     
-    # Get category info
-    category_info = template_manager.get_category_info()
-    
-    # Menu items
-    menu_items = []
-    for i, (category, (name, count)) in enumerate(category_info.items()):
-        key = str(i + 1)
-        menu_items.append((key, category, name, count))
-    
-    # Add quit option
-    menu_items.append(("q", None, "Quit", 0))
+    # Menu items, including the quit option
+    menu_items = template_manager.get_menu_items()
     
     for i, (key, category, name, count) in enumerate(menu_items):
         y = 7 + i * 2
@@ -313,28 +516,25 @@ def draw_menu(stdscr, height, width, template_manager: TemplateManager) -> Optio
             stdscr.addstr(y, width // 4, f"[{key}]")
             
             if category:
-                color_pair = 2 if count > 0 else 3
-                stdscr.attron(curses.color_pair(color_pair) | curses.A_BOLD)
-                stdscr.addstr(y, width // 4 + 4, f"{name}")
-                stdscr.attroff(curses.color_pair(color_pair) | curses.A_BOLD)
+                attr = CP_CORRECT if count > 0 else CP_WRONG
+                stdscr.addstr(y, width // 4 + 4, f"{name}", attr)
                 stdscr.addstr(y, width // 4 + 30, f"({count} templates)")
             else:
-                stdscr.attron(curses.color_pair(3))
-                stdscr.addstr(y, width // 4 + 4, name)
-                stdscr.attroff(curses.color_pair(3))
+                stdscr.addstr(y, width // 4 + 4, name, CP_BAD)
         except:
             pass
     
     # Instructions
     try:
-        stdscr.attron(curses.color_pair(4))
-        stdscr.addstr(height-3, 2, "Press number key to select category, 'q' to quit")
-        stdscr.attroff(curses.color_pair(4))
+        stdscr.addstr(height-3, 2, "Press number key to select category, 'q' to quit", CP_INFO)
     except:
         pass
     
     stdscr.refresh()
     
+    # Map key codes straight to categories
+    key_to_category = {ord(num_key): category for num_key, category, _, _ in menu_items if category}
+    
     # Get user input
     while True:
         key = stdscr.getch()
@@ -343,27 +543,50 @@ def draw_menu(stdscr, height, width, template_manager: TemplateManager) -> Optio
             return None
         
         # Check number keys
-        for i, (num_key, category, _, _) in enumerate(menu_items):
-            if num_key != "q" and key == ord(num_key):
-                return category
+        if key in key_to_category:
+            return key_to_category[key]
 
 def draw_status_bar(stdscr, height, width, test: TypingTest, category_name: str):
-    """Draw the status bar at the bottom"""
-    instant_wpm = test.calculate_instant_wpm()
-    avg_wpm = test.calculate_average_wpm()
-    accuracy = test.calculate_accuracy()
-    current_template, total_templates, current_line, total_lines, completed_chars, total_chars = test.get_progress()
-    
-    statusbarstr = f" WPM: {instant_wpm:>5.1f} (avg: {avg_wpm:>5.1f}) | Accuracy: {accuracy:>5.1f}% | Template: {current_template}/{total_templates} | Line: {current_line}/{total_lines} | Chars: {completed_chars}/{total_chars} | {category_name} "
+    """Draw the status bar on the last row of the given window (height is the window's height)"""
+    statusbarstr = test.status_text(category_name)
     
-    # Clear and draw status bar
+    # Pad to the full row so the bar overwrites whatever was there before
     try:
-        stdscr.attron(curses.color_pair(4))
-        stdscr.addstr(height-1, 0, statusbarstr[:width-1])
-        stdscr.attroff(curses.color_pair(4))
+        stdscr.addstr(height-1, 0, statusbarstr.ljust(width-1)[:width-1], CP_INFO)
     except:
         pass
 
+def _match_runs(line_len: int, matches: List[bool]) -> List[Tuple[int, int, Optional[bool]]]:
+    """Split a line into (start, end, status) runs: True/False for typed chars, None for the rest"""
+    runs = []
+    typed_len = min(len(matches), line_len)
+    start = 0
+    for j in range(1, typed_len + 1):
+        if j == typed_len or matches[j] != matches[start]:
+            runs.append((start, j, matches[start]))
+            start = j
+    if typed_len < line_len:
+        runs.append((typed_len, line_len, None))
+    return runs
+
+def _draw_wrapped_runs(stdscr, y: int, x: int, wrap_x: int, right: int, text: str,
+                       runs: List[Tuple[int, int, Optional[bool]]], attrs: Dict) -> Tuple[int, int]:
+    """Draw text with one addstr per run, wrapping to wrap_x at column right. Returns the (y, x) after it."""
+    for start, end, status in runs:
+        attr = attrs[status]
+        while start < end:
+            if x >= right:
+                y += 1
+                x = wrap_x
+            stop = min(end, start + right - x)
+            try:
+                stdscr.addstr(y, x, text[start:stop], attr)
+            except curses.error:
+                pass
+            x += stop - start
+            start = stop
+    return y, x
+
 def draw_content(stdscr, test: TypingTest, start_y: int, width: int, height: int):
     """Draw all lines with visual feedback and proper indentation preservation"""
     y = start_y
@@ -371,10 +594,8 @@ def draw_content(stdscr, test: TypingTest, start_y: int, width: int, height: int
     # Show template header
     current_template, total_templates, current_line, total_lines, _, _ = test.get_progress()
     try:
-        stdscr.attron(curses.color_pair(4) | curses.A_BOLD)
         header = f"Template {current_template} of {total_templates} (Line {current_line}/{total_lines})"
-        stdscr.addstr(y, 2, header)
-        stdscr.attroff(curses.color_pair(4) | curses.A_BOLD)
+        stdscr.addstr(y, 2, header, CP_INFO_BOLD)
         y += 2
     except:
         pass
@@ -393,73 +614,34 @@ def draw_content(stdscr, test: TypingTest, start_y: int, width: int, height: int
             try:
                 stdscr.addstr(y, 2, "✓ ")
                 # Preserve indentation by not stripping the line
-                stdscr.attron(curses.color_pair(2))
-                stdscr.addstr(y, 4, line[:width-6])
-                stdscr.attroff(curses.color_pair(2))
+                stdscr.addstr(y, 4, line[:width-6], CP_GOOD)
             except:
                 pass
             y += 1
             
         elif i == test.current_line_index:
             # Current line - show with typing feedback
+            ui = test.user_input
+            runs = _match_runs(len(line), test.matches)
             try:
                 stdscr.addstr(y, 2, "▶ ")
-                
-                # Draw the target line character by character with colors
-                x_pos = 4
-                for j, char in enumerate(line):
-                    if x_pos >= width - 2:
-                        y += 1
-                        x_pos = 4
-                        # Continue on next line
-                    
-                    char_status = test.check_character(j)
-                    
-                    try:
-                        if char_status is True:
-                            stdscr.attron(curses.color_pair(2) | curses.A_BOLD)
-                            stdscr.addstr(y, x_pos, char)
-                            stdscr.attroff(curses.color_pair(2) | curses.A_BOLD)
-                        elif char_status is False:
-                            stdscr.attron(curses.color_pair(3) | curses.A_BOLD)
-                            stdscr.addstr(y, x_pos, char)
-                            stdscr.attroff(curses.color_pair(3) | curses.A_BOLD)
-                        else:
-                            stdscr.addstr(y, x_pos, char)
-                    except:
-                        pass
-                    
-                    x_pos += 1
-                
-                y += 1  # Move past the target line
-                
             except:
-                y += 1
+                pass
+            
+            # Draw the target line one colored run at a time
+            y, _ = _draw_wrapped_runs(stdscr, y, 4, 4, width - 2, line, runs, TARGET_ATTRS)
+            y += 1  # Move past the target line
             
             # Show what user has typed
-            if test.user_input:
+            if ui:
                 try:
                     stdscr.addstr(y, 2, "You: ")
-                    user_str = ''.join(test.user_input)
+                    user_str = ''.join(ui)
                     
-                    # Show user input with proper indentation
-                    x_pos = 7
-                    for j, char in enumerate(user_str):
-                        if x_pos >= width - 2:
-                            y += 1
-                            x_pos = 2
-                        
-                        # Check if this character matches the target
-                        if j < len(line) and char == line[j]:
-                            stdscr.attron(curses.color_pair(2))
-                            stdscr.addstr(y, x_pos, char)
-                            stdscr.attroff(curses.color_pair(2))
-                        else:
-                            stdscr.attron(curses.color_pair(3))
-                            stdscr.addstr(y, x_pos, char)
-                            stdscr.attroff(curses.color_pair(3))
-                        
-                        x_pos += 1
+                    # The echo reuses the target's runs: input never runs past the line,
+                    # and only the last run can be the untyped remainder
+                    typed_runs = runs[:-1] if runs[-1][2] is None else runs
+                    y, x_pos = _draw_wrapped_runs(stdscr, y, 7, 2, width - 2, user_str, typed_runs, ECHO_ATTRS)
                     
                     # Show cursor
                     if x_pos < width - 1:
@@ -467,15 +649,11 @@ def draw_content(stdscr, test: TypingTest, start_y: int, width: int, height: int
                     
                     # Show line completion status
                     if test.is_line_complete():
-                        stdscr.attron(curses.color_pair(2))
-                        stdscr.addstr(y, x_pos + 1, " ✓ Press Enter")
-                        stdscr.attroff(curses.color_pair(2))
+                        stdscr.addstr(y, x_pos + 1, " ✓ Press Enter", CP_GOOD)
                     else:
                         remaining = len(line) - len(user_str)
                         if remaining > 0:
-                            stdscr.attron(curses.color_pair(4))
-                            stdscr.addstr(y, x_pos + 1, f" ({remaining} left)")
-                            stdscr.attroff(curses.color_pair(4))
+                            stdscr.addstr(y, x_pos + 1, f" ({remaining} left)", CP_INFO)
                     
                     y += 1
                 except:
@@ -483,9 +661,7 @@ def draw_content(stdscr, test: TypingTest, start_y: int, width: int, height: int
         else:
             # Future lines - show in dim with preserved indentation
             try:
-                stdscr.attron(curses.A_DIM)
-                stdscr.addstr(y, 4, line[:width-6])
-                stdscr.attroff(curses.A_DIM)
+                stdscr.addstr(y, 4, line[:width-6], CP_DIM)
             except:
                 pass
             y += 1
@@ -498,41 +674,41 @@ def draw_progress_bar(stdscr, test: TypingTest, start_y: int, width: int):
     """Draw a progress bar"""
     _, _, _, _, completed_chars, total_chars = test.get_progress()
     percentage = completed_chars / total_chars if total_chars > 0 else 0
-    bar_width = min(50, width - 10)
+    bar_width = min(PROGRESS_BAR_WIDTH, width - 10)
     filled = int(bar_width * percentage)
     
     try:
         stdscr.addstr(start_y, 2, "Progress: [")
-        stdscr.attron(curses.color_pair(2))
-        stdscr.addstr(start_y, 13, "█" * filled)
-        stdscr.attroff(curses.color_pair(2))
-        stdscr.addstr(start_y, 13 + filled, "░" * (bar_width - filled))
+        stdscr.addstr(start_y, 13, _BAR_FILLED[:filled], CP_GOOD)
+        stdscr.addstr(start_y, 13 + filled, _BAR_EMPTY[:bar_width - filled])
         stdscr.addstr(start_y, 13 + bar_width, f"] {percentage*100:.1f}%")
     except:
         pass
 
-def draw_instructions(stdscr, height: int):
-    """Draw instructions at the bottom"""
+def draw_instructions(stdscr, height: int, flash: Optional[str] = None):
+    """Draw instructions at the bottom, with an optional warning just above them"""
+    if flash:
+        try:
+            stdscr.addstr(height-4, 2, flash, CP_BAD)
+        except:
+            pass
+    
     try:
-        stdscr.attron(curses.color_pair(4))
-        stdscr.addstr(height-3, 2, "Enter: Submit line | Backspace: Delete | ESC: Menu")
-        stdscr.attroff(curses.color_pair(4))
+        stdscr.addstr(height-3, 2, "Enter: Submit line | Backspace: Delete | ESC: Menu", CP_INFO)
     except:
         pass
 
 def draw_results(stdscr, height, width, test: TypingTest, category_name: str):
     """Draw test results with proper alignment"""
-    stdscr.clear()
+    stdscr.erase()
     
-    instant_wpm = test.calculate_instant_wpm()
-    avg_wpm = test.calculate_average_wpm()
-    accuracy = test.calculate_accuracy()
+    instant_wpm, avg_wpm, accuracy = test.get_stats()
     
-    # Make sure end_time is set
-    if test.end_time is None and test.start_time is not None:
-        test.end_time = time.time()
+    # Make sure end_ns is set
+    if test.end_ns is None and test.start_ns is not None:
+        test.end_ns = time.monotonic_ns()
     
-    total_time = test.end_time - test.start_time if test.end_time and test.start_time else 0
+    total_time = (test.end_ns - test.start_ns) / 1e9 if test.start_ns is not None else 0
     
     # Create properly aligned box
     results = [
@@ -549,21 +725,17 @@ def draw_results(stdscr, height, width, test: TypingTest, category_name: str):
     ]
     
     # Calculate starting Y position to center vertically
-    start_y = max(0, (height // 2) - (len(results) // 2))
+    start_y = max(0, (height - len(results)) // 2)
     
     for i, line in enumerate(results):
         # Center each line horizontally
-        x = max(0, (width // 2) - (len(line) // 2))
+        x = _center_x(width, line)
         try:
             # Add some styling
             if i == 1:  # Title line
-                stdscr.attron(curses.color_pair(2) | curses.A_BOLD)
-                stdscr.addstr(start_y + i, x, line)
-                stdscr.attroff(curses.color_pair(2) | curses.A_BOLD)
+                stdscr.addstr(start_y + i, x, line, CP_CORRECT)
             elif i >= 3 and i <= 6:  # Stats lines
-                stdscr.attron(curses.color_pair(4))
-                stdscr.addstr(start_y + i, x, line)
-                stdscr.attroff(curses.color_pair(4))
+                stdscr.addstr(start_y + i, x, line, CP_INFO)
             else:
                 stdscr.addstr(start_y + i, x, line)
         except curses.error:
@@ -580,6 +752,11 @@ def init_template_directories():
     script_dir = Path(__file__).parent.absolute()
     templates_dir = script_dir / "templates"
     
+    # Samples only need writing once; the sentinel saves the per-file checks on later launches
+    sentinel = templates_dir / ".initialized"
+    if sentinel.exists():
+        return
+    
     # Create directories and sample files if they don't exist
     samples = {
         "easy/01_basic.txt": [
@@ -684,38 +861,78 @@ def init_template_directories():
         ]
     }
     
+    for directory in {(templates_dir / filepath).parent for filepath in samples}:
+        directory.mkdir(parents=True, exist_ok=True)
+    
     for filepath, content in samples.items():
         full_path = templates_dir / filepath
-        full_path.parent.mkdir(parents=True, exist_ok=True)
         
         if not full_path.exists():
             with open(full_path, 'w') as f:
                 f.write('\n'.join(content))
             print(f"Created sample: {filepath}")
+    
+    # A read-only templates directory just means the checks run again next time
+    try:
+        sentinel.touch()
+    except OSError:
+        pass
+
+def init_colors():
+    """Set up the color pairs and compute the attributes used by the draw functions"""
+    global CP_GOOD, CP_BAD, CP_CORRECT, CP_WRONG, CP_INFO, CP_INFO_BOLD, CP_DIM
+    if curses.has_colors():
+        curses.start_color()
+        # Keep the terminal's own background (-1) so color changes don't also set one
+        try:
+            curses.use_default_colors()
+            bg = -1
+        except curses.error:
+            bg = curses.COLOR_BLACK
+        # Only the pairs read below; plain text uses the default pair
+        for pair, fg in ((2, curses.COLOR_GREEN), (3, curses.COLOR_RED), (4, curses.COLOR_CYAN)):
+            curses.init_pair(pair, fg, bg)
+        CP_GOOD = curses.color_pair(2)
+        CP_BAD = curses.color_pair(3)
+        CP_INFO = curses.color_pair(4)
+    else:
+        # Monochrome terminal: underline mistakes so they still stand out
+        CP_GOOD = CP_INFO = curses.A_NORMAL
+        CP_BAD = curses.A_UNDERLINE
+    CP_CORRECT = CP_GOOD | curses.A_BOLD
+    CP_WRONG = CP_BAD | curses.A_BOLD
+    CP_INFO_BOLD = CP_INFO | curses.A_BOLD
+    CP_DIM = curses.A_DIM
+    TARGET_ATTRS.update({True: CP_CORRECT, False: CP_WRONG, None: curses.A_NORMAL})
+    ECHO_ATTRS.update({True: CP_GOOD, False: CP_BAD})
 
 def main(stdscr):
     # Setup
     curses.curs_set(0)  # Hide cursor
-    curses.start_color()
-    curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)
-    curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)
-    curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)
-    curses.init_pair(4, curses.COLOR_CYAN, curses.COLOR_BLACK)
+    init_colors()
     
     # Initialize template manager
     template_manager = TemplateManager()
     
-    # Create sample files
-    init_template_directories()
+    cfg = CONFIG
+    min_height, min_width = cfg.min_terminal_height, cfg.min_terminal_width
+    
+    # Local names for what the typing loop looks up on every key and tick
+    getch = stdscr.getch
+    doupdate = curses.doupdate
+    monotonic_ns = time.monotonic_ns
+    key_resize = curses.KEY_RESIZE
+    backspace_keys = (curses.KEY_BACKSPACE, 127, 8)
+    enter_keys = (curses.KEY_ENTER, 10, 13)
     
     while True:
         # Get terminal size
         height, width = stdscr.getmaxyx()
         
         # Check terminal size
-        if height < 24 or width < 80:
-            stdscr.clear()
-            stdscr.addstr(0, 0, "Terminal too small! Please resize to at least 80x24.")
+        if height < min_height or width < min_width:
+            stdscr.erase()
+            stdscr.addstr(0, 0, f"Terminal too small! Please resize to at least {min_width}x{min_height}.")
             stdscr.addstr(1, 0, f"Current: {width}x{height}")
             stdscr.addstr(2, 0, "Press any key...")
             stdscr.refresh()
@@ -734,59 +951,139 @@ def main(stdscr):
         # Initialize test
         test = TypingTest(category, templates)
         
-        # Main typing loop
+        # Main typing loop; wake periodically so the WPM display keeps moving while idle
+        stdscr.timeout(TICK_INTERVAL_MS)
+        tick_period_ns = 1_000_000_000 // WPM_SAMPLES_PER_SECOND
+        last_tick_ns = monotonic_ns()
+        finished = False
+        dirty = True
+        status_dirty = True
+        flash = None
+        flash_until_ns = 0
+        
+        # The status bar gets its own window so timer ticks only repaint that row
+        content_win = curses.newwin(height - 1, width, 0, 0)
+        status_win = curses.newwin(1, width, height - 1, 0)
+        # Status text currently shown in status_win
+        drawn_status = None
+        
         while True:
-            stdscr.clear()
+            if dirty:
+                content_win.erase()
+                
+                # Draw UI
+                last_y = draw_content(content_win, test, 3, width, height)
+                draw_progress_bar(content_win, test, last_y + 1, width)
+                if flash and monotonic_ns() >= flash_until_ns:
+                    flash = None
+                draw_instructions(content_win, height, flash)
+                
+                content_win.noutrefresh()
+                dirty = False
+                status_dirty = True
             
-            # Draw UI
-            last_y = draw_content(stdscr, test, 3, width, height)
-            draw_progress_bar(stdscr, test, last_y + 1, width)
-            draw_status_bar(stdscr, height, width, test, category_name)
-            draw_instructions(stdscr, height)
+            if status_dirty:
+                # Leave the row alone when its text is already what is on screen
+                status_text = test.status_text(category_name)
+                if status_text != drawn_status:
+                    # The bar is padded to the whole row, so there is nothing to erase first
+                    draw_status_bar(status_win, 1, width, test, category_name)
+                    status_win.noutrefresh()
+                    drawn_status = status_text
+                status_dirty = False
             
-            stdscr.refresh()
+            # Push all pending window changes to the terminal in one update
+            doupdate()
             
             # Get user input
-            key = stdscr.getch()
-            
-            # Handle escape key
-            if key == 27:
-                break
+            key = getch()
             
-            # Handle backspace
-            elif key in (curses.KEY_BACKSPACE, 127, 8):
-                if test.user_input:
-                    test.user_input.pop()
+            # Apply every key that is already queued (a paste arrives as a burst) before drawing again
+            leave = False
+            if key != -1:
+                stdscr.timeout(INPUT_POLL_ACTIVE_MS)
+            while key != -1:
+                # Handle escape key
+                if key == 27:
+                    leave = True
+                    break
+                
+                elif key == key_resize:
+                    # The size is only re-queried when the terminal reports a resize
+                    height, width = stdscr.getmaxyx()
+                    content_win = curses.newwin(max(1, height - 1), width, 0, 0)
+                    status_win = curses.newwin(1, width, max(0, height - 1), 0)
+                    drawn_status = None
+                    dirty = True
+                
+                # Handle backspace
+                elif key in backspace_keys:
+                    if test.delete_char():
+                        dirty = True
+                
+                # Handle enter
+                elif key in enter_keys:
+                    if test.user_input and test.is_line_complete():
+                        if test.submit_line():  # This now sets end_ns automatically
+                            finished = leave = True
+                            break
+                        dirty = True
+                    elif test.user_input:
+                        # Show a warning for a moment without blocking input
+                        flash = "Complete the line first!"
+                        flash_until_ns = monotonic_ns() + FLASH_DURATION_MS * 1_000_000
+                        dirty = True
+                
+                # Handle regular characters
+                elif 32 <= key <= 126:
+                    current_line = test.get_current_line()
+                    if current_line and len(test.user_input) < len(current_line):
+                        test.type_char(chr(key))
+                        dirty = True
+                
+                key = getch()
             
-            # Handle enter
-            elif key in (curses.KEY_ENTER, 10, 13):
-                if test.user_input and test.is_line_complete():
-                    if test.submit_line():  # This now sets end_time automatically
-                        draw_results(stdscr, height, width, test, category_name)
-                        break
-                elif test.user_input:
-                    try:
-                        stdscr.attron(curses.color_pair(3))
-                        stdscr.addstr(height-4, 2, "Complete the line first!")
-                        stdscr.attroff(curses.color_pair(3))
-                        stdscr.refresh()
-                    except:
-                        pass
-                    time.sleep(0.5)
+            stdscr.timeout(TICK_INTERVAL_MS)
+            if leave:
+                break
             
-            # Handle regular characters
-            elif 32 <= key <= 126:
-                current_line = test.get_current_line()
-                if current_line and len(test.user_input) < len(current_line):
-                    test.user_input.append(chr(key))
+            # Timer tick: checked on every pass, not just on getch timeouts, so
+            # WPM keeps being sampled about once per period during steady typing
+            now_ns = monotonic_ns()
+            if test.start_ns is not None and now_ns - last_tick_ns >= tick_period_ns:
+                last_tick_ns = now_ns
+                test.tick()
+                status_dirty = True
+            # Clear an expired warning
+            if flash and now_ns >= flash_until_ns:
+                dirty = True
+        
+        # Back to blocking input for the results screen and menu
+        stdscr.timeout(-1)
+        if finished:
+            draw_results(stdscr, height, width, test, category_name)
 
-if __name__ == "__main__":
+def _report_error(exc_type, exc_value, exc_tb):
+    """Print an uncaught error in one write; curses.wrapper has restored the terminal by now"""
+    import traceback
+    sys.stderr.write(f"Error: {exc_value}\n" + "".join(traceback.format_exception(exc_type, exc_value, exc_tb)))
+
+def run():
+    """Run the app in a single curses session, exiting cleanly on Ctrl+C or errors"""
+    previous_hook = sys.excepthook
+    sys.excepthook = _report_error
     try:
+        # Create sample files first, so their messages go to the normal terminal
+        init_template_directories()
         curses.wrapper(main)
     except KeyboardInterrupt:
         sys.exit(0)
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+    except Exception:
+        # The hook is restored before the error could reach the interpreter, so report it here
+        sys.excepthook(*sys.exc_info())
+        sys.exit(1)
+    finally:
+        sys.excepthook = previous_hook
+
+if __name__ == "__main__":
+    run()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from termtype import TemplateManager
+
+
+class ParseTemplateFileTest(unittest.TestCase):
+    """Pins how template files are split on '---' and how comments are dropped"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manager = TemplateManager(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def parse(self, content):
+        return self.manager._parse_template_file(content)
+
+    def test_separator_splits_templates(self):
+        self.assertEqual(self.parse("one\n---\ntwo\nthree"), [["one"], ["two", "three"]])
+
+    def test_comment_lines_are_dropped(self):
+        content = "# Header\nfirst\n  # indented comment\nsecond"
+        self.assertEqual(self.parse(content), [["first", "second"]])
+
+    def test_template_after_header_comment_is_kept(self):
+        content = "# Python templates\n\ndef f():\n    pass\n---\nx = 1"
+        self.assertEqual(self.parse(content), [["def f():", "    pass"], ["x = 1"]])
+
+    def test_blank_edges_trimmed_and_indentation_kept(self):
+        content = "\n\nif x:\n    y()\n\n---\n\n"
+        self.assertEqual(self.parse(content), [["if x:", "    y()"]])
+
+    def test_empty_and_comment_only_templates_are_skipped(self):
+        self.assertEqual(self.parse("---\n# only a comment\n---\n\n---\nkept"), [["kept"]])
+
+    def test_separator_must_be_the_whole_line(self):
+        self.assertEqual(self.parse("a\n --- \nb---"), [["a", " --- ", "b---"]])
+
+    def test_only_newlines_split_lines(self):
+        self.assertEqual(self.parse("a\x0cb\u2028c\nd"), [["a\x0cb\u2028c", "d"]])
+
+
+class LoadTemplatesTest(unittest.TestCase):
+    def test_crlf_files_load_like_lf_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            category_dir = Path(tmp) / "easy"
+            category_dir.mkdir()
+            (category_dir / "01.txt").write_bytes(b"# Easy\r\nfirst line\r\n---\r\nsecond\r\n")
+            manager = TemplateManager(tmp)
+            self.assertEqual(manager.load_templates("easy"), [["first line"], ["second"]])
+
+    def test_unreadable_category_does_not_hide_the_others(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for category in ("easy", "hard"):
+                (Path(tmp) / category).mkdir()
+                (Path(tmp) / category / "01.txt").write_text(category)
+            manager = TemplateManager(tmp)
+            real_scan = manager._scan_category
+
+            def scan(path):
+                if path.endswith("easy"):
+                    raise PermissionError(path)
+                return real_scan(path)
+
+            with mock.patch.object(manager, "_scan_category", side_effect=scan):
+                self.assertEqual(set(manager._scan_all()), {"hard"})
+            self.assertEqual(manager.load_templates("hard"), [["hard"]])
+
+    def test_index_is_reused_when_files_are_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            category_dir = Path(tmp) / "easy"
+            category_dir.mkdir()
+            (category_dir / "01.txt").write_text("one\n---\ntwo")
+            TemplateManager(tmp).get_category_info()
+
+            manager = TemplateManager(tmp)
+            with mock.patch.object(manager, "_read_files", side_effect=AssertionError("re-parsed")):
+                self.assertEqual(manager.load_templates("easy"), [["one"], ["two"]])
+
+    def test_malformed_index_is_a_cache_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            category_dir = Path(tmp) / "easy"
+            category_dir.mkdir()
+            (category_dir / "01.txt").write_text("one")
+            manager = TemplateManager(tmp)
+            for payload in ('not json', '[1, 2]', '{"version": %d, "categories": {"easy": [[["x"]], 3]}}'
+                            % TemplateManager._INDEX_VERSION):
+                manager._index_path.write_text(payload)
+                manager._index = None
+                manager.cache.clear()
+                self.assertEqual(manager.load_templates("easy"), [["one"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+import termtype
+from termtype import TypingTest, _match_runs
+
+
+class WpmHistoryTest(unittest.TestCase):
+    """Pins the running sum kept next to the bounded WPM history"""
+
+    def test_average_after_history_wraps(self):
+        test = TypingTest("easy", [["abcde"]])
+        test.start_ns = 0
+        test.completed_chars = 50
+        capacity = test.wpm_history.maxlen
+        clock = iter(range(1_000_000_000, (capacity * 3 + 2) * 1_000_000_000, 1_000_000_000))
+        with mock.patch.object(termtype.time, "monotonic_ns", side_effect=lambda: next(clock)):
+            for _ in range(capacity * 3):
+                test.tick()
+
+        self.assertEqual(len(test.wpm_history), capacity)
+        self.assertAlmostEqual(test._wpm_sum, sum(test.wpm_history))
+        self.assertEqual(test.calculate_average_wpm(),
+                         round(sum(test.wpm_history) / len(test.wpm_history), 1))
+
+    def test_tick_before_start_records_nothing(self):
+        test = TypingTest("easy", [["abc"]])
+        test.tick()
+        self.assertEqual(len(test.wpm_history), 0)
+        self.assertEqual(test.calculate_average_wpm(), 0.0)
+
+
+class MatchBookkeepingTest(unittest.TestCase):
+    """Pins the per-character matches kept in step by type_char/delete_char"""
+
+    def type(self, test, text):
+        for char in text:
+            test.type_char(char)
+
+    def test_backspace_and_retype_restores_accuracy(self):
+        test = TypingTest("easy", [["abc", "de"]])
+        self.type(test, "abx")
+        self.assertEqual(test.matches, [True, True, False])
+        self.assertTrue(test.delete_char())
+        self.type(test, "c")
+        self.assertEqual(test.matches, [True, True, True])
+        self.assertEqual(test._correct_in_line, 3)
+
+        test.submit_line()
+        self.assertEqual(test.calculate_accuracy(), 100.0)
+        self.assertEqual((test.matches, test._correct_in_line), ([], 0))
+
+    def test_mistakes_left_in_a_line_count_against_accuracy(self):
+        test = TypingTest("easy", [["abc", "de"]])
+        self.type(test, "axc")
+        test.submit_line()
+        self.type(test, "dx")
+        self.assertTrue(test.delete_char())
+        self.assertTrue(test.delete_char())
+        self.assertFalse(test.delete_char())
+        self.type(test, "de")
+        self.assertTrue(test.submit_line())
+        self.assertEqual((test.correct_chars, test.total_chars), (4, 5))
+        self.assertEqual(test.calculate_accuracy(), 80.0)
+
+
+class MatchRunsTest(unittest.TestCase):
+    def test_splits_typed_chars_into_runs_and_leaves_the_rest_untyped(self):
+        self.assertEqual(_match_runs(6, [True, True, False, True]),
+                         [(0, 2, True), (2, 3, False), (3, 4, True), (4, 6, None)])
+
+    def test_nothing_typed(self):
+        self.assertEqual(_match_runs(3, []), [(0, 3, None)])
+
+    def test_fully_typed_line_has_no_untyped_run(self):
+        self.assertEqual(_match_runs(2, [False, False]), [(0, 2, False)])
+
+    def test_empty_line(self):
+        self.assertEqual(_match_runs(0, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()